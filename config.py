@@ -1,11 +1,25 @@
 """
 config.py – Centralised game settings for Connect 4.
 
-Defines board dimensions, player and draw colours, and minimax search depth.
+Defines board dimensions, cell geometry, player and draw colours, and minimax search depth.
 """
 
 ROW_COUNT = 6
 COLUMN_COUNT = 7
+CELL_SIZE = 100  # width/height of one board cell in pixels
+
+# Canvas corners (x0, y0, x1, y1) of every cell, indexed [row][col]
+CELL_COORDS = tuple(
+    tuple(
+        (col * CELL_SIZE, row * CELL_SIZE, (col + 1) * CELL_SIZE, (row + 1) * CELL_SIZE)
+        for col in range(COLUMN_COUNT)
+    )
+    for row in range(ROW_COUNT)
+)
+
+# Board column under each canvas x pixel
+COLUMN_AT_X = bytes(x // CELL_SIZE for x in range(COLUMN_COUNT * CELL_SIZE))
+
 PLAYER_1_COLOUR = "green"
 PLAYER_2_COLOUR = "red"
 DRAW_COLOUR = "gray"
@@ -18,17 +18,27 @@ Reference:
 """
 
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import PhotoImage
+from tkinter import font as tkFont
 from config import (
     ROW_COUNT,
     COLUMN_COUNT,
+    CELL_SIZE,
+    CELL_COORDS,
+    COLUMN_AT_X,
     PLAYER_1_COLOUR,
     PLAYER_2_COLOUR,
     DRAW_COLOUR,
     SEARCH_DEPTH,
 )
-from game import Connect4
-import math
+from game import AGENT_MOVES, Connect4, NEG_INF, POS_INF
+
+# How often (ms) the GUI checks whether a background AI move has finished
+AI_POLL_INTERVAL = 20
+
+# Levels of the minimax tree shown before deeper subtrees are collapsed
+TREE_PRINT_DEPTH = 2
 
 
 class Connect4GUI:
@@ -43,10 +53,50 @@ class Connect4GUI:
         "minimax_ml": "Minimax-Trained ML Agent",
     }
 
+    # Shared Tk fonts, created once by _init_fonts so labels reuse one native font each
+    _FONT_STATUS = None
+    _FONT_TURN = None
+    _FONT_INSTRUCTIONS = None
+    _FONT_BUTTON = None
+    _FONT_GAME_OVER = None
+    _FONT_TREE = None
+    _FONT_STATS_TITLE = None
+    _FONT_STATS = None
+
+    # Board images shared by every game, created once by _init_board_images
+    _DISC_TILES = None  # disc colour -> cell tile
+    _EMPTY_BOARD = None
+
+    @classmethod
+    def _init_fonts(cls, root):
+        """Creates the shared fonts the first time a game window is opened."""
+        if cls._FONT_STATUS is not None:
+            return
+        cls._FONT_STATUS = tkFont.Font(root=root, family="Helvetica", size=14)
+        cls._FONT_TURN = tkFont.Font(root=root, family="Helvetica", size=12)
+        cls._FONT_INSTRUCTIONS = tkFont.Font(root=root, family="Helvetica", size=11)
+        cls._FONT_BUTTON = tkFont.Font(
+            root=root, family="Helvetica", size=10, weight="bold"
+        )
+        cls._FONT_GAME_OVER = tkFont.Font(
+            root=root, family="Helvetica", size=32, weight="bold"
+        )
+        cls._FONT_TREE = tkFont.Font(root=root, family="Courier", size=10)
+        cls._FONT_STATS_TITLE = tkFont.Font(
+            root=root, family="Helvetica", size=16, weight="bold"
+        )
+        cls._FONT_STATS = tkFont.Font(root=root, family="Helvetica", size=12)
+
     def __init__(
-        self, agent1_type, agent2_type, agent1_model=None, agent2_model=None, root=None
+        self,
+        agent1_type,
+        agent2_type,
+        agent1_model=None,
+        agent2_model=None,
+        root=None,
+        start_screen=None,
     ):
-        """Initialises the game window, sets up the board, sidebar, and event handlers."""
+        """Builds the game screen in the main window, sets up the board, sidebar, and event handlers."""
         self.turn = 0
 
         self.agent1_type = agent1_type
@@ -54,11 +104,19 @@ class Connect4GUI:
         self.agent1_model = agent1_model
         self.agent2_model = agent2_model
 
-        # New window for GUI
-        self.root = tk.Toplevel(root)
+        # Rendered minimax trees keyed by (board hash, player, depth). Only read and
+        # written on the Tk thread: request_tree_view hands cached trees to the worker,
+        # and _finish_tree_view stores the ones it searched
+        self._tree_cache = {}
+
+        # Game screen is a frame in the main window, swapped with the start screen's
+        self.frame = tk.Frame(root)
+        self.frame.pack()
+        self.root = self.frame.winfo_toplevel()
+        self.start_screen = start_screen
         self.root.title("Connect 4")
-        self.parent_root = root
         self.root.minsize(1000, 700)
+        self._init_fonts(self.root)
 
         # Exit cleanly when users close window using x button
         self.root.protocol("WM_DELETE_WINDOW", self.exit_game)
@@ -68,14 +126,74 @@ class Connect4GUI:
             agent2_type=agent2_type,
             agent1_model=agent1_model,
             agent2_model=agent2_model,
+            collect_stats="minimax" in (agent1_type, agent2_type),
+        )
+
+        # Per-player details indexed by turn parity: 0 = Player 1, 1 = Player 2
+        self._player_info = [
+            (
+                agent1_type,
+                agent1_model,
+                PLAYER_1_COLOUR,
+                self.AGENT_DISPLAY_NAMES.get(agent1_type, agent1_type),
+                self.game.PLAYER_1,
+            ),
+            (
+                agent2_type,
+                agent2_model,
+                PLAYER_2_COLOUR,
+                self.AGENT_DISPLAY_NAMES.get(agent2_type, agent2_type),
+                self.game.PLAYER_2,
+            ),
+        ]
+
+        # Sidebar texts for each player, fixed for the whole game
+        self._turn_labels = tuple(
+            f"Player {number} ({agent_display})'s turn"
+            for number, (_, _, _, agent_display, _) in enumerate(
+                self._player_info, start=1
+            )
+        )
+        self._win_labels = tuple(
+            f"Player {number}\n({agent_display}) wins!"
+            for number, (_, _, _, agent_display, _) in enumerate(
+                self._player_info, start=1
+            )
         )
+        self._win_messages = ("Player 1 Wins!", "Player 2 Wins!")
 
-        self.main_frame = tk.Frame(self.root)
+        # Each player's move function, resolved once (None for humans)
+        self._move_fns = tuple(
+            AGENT_MOVES.get(agent_type) for agent_type, _, _, _, _ in self._player_info
+        )
+
+        # AI moves are computed on a worker thread so the window stays responsive.
+        # It must stay a single worker: AI searches and tree views run on the game and
+        # its copies, which share the transposition, killer and history tables, so
+        # only one search may run at a time
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._ai_future = None  # pending AI move, if any
+
+        # Cleared when the window closes so no further AI turns are scheduled
+        self._alive = True
+        self._pending_turn = None  # after() ID of the pending AI move check
+        self.game_over = False
+        self.game_over_label = None  # shown over the board once the game ends
+
+        # Set while it's an AI's turn or the game is over, so board clicks are ignored
+        self._input_locked = agent1_type != "human"
+
+        self.main_frame = tk.Frame(self.frame)
         self.main_frame.pack(padx=20, pady=20)
 
         # Left side: board
         # Canvas for drawing grid
-        self.canvas = tk.Canvas(self.main_frame, width=700, height=600, bg="white")
+        self.canvas = tk.Canvas(
+            self.main_frame,
+            width=COLUMN_COUNT * CELL_SIZE,
+            height=ROW_COUNT * CELL_SIZE,
+            bg="white",
+        )
         self.canvas.pack(side=tk.LEFT)
 
         self.canvas.bind("<Button-1>", self.click_handler)
@@ -90,33 +208,41 @@ class Connect4GUI:
         self.reset_icon = PhotoImage(file="icons/reset.png")
         self.new_game_icon = PhotoImage(file="icons/new_game.png")
         self.exit_icon = PhotoImage(file="icons/exit.png")
-        self.tree_icon = PhotoImage(file="icons/tree.png")
 
         # Shows final outcome
-        self.status_label = tk.Label(self.sidebar, text="", font=("Helvetica", 14))
+        self.status_label = tk.Label(self.sidebar, text="", font=self._FONT_STATUS)
         self.status_label.pack(pady=10)
 
         # Shows whose turn it is
-        self.turn_label = tk.Label(self.sidebar, text="", font=("Helvetica", 12))
+        self.turn_label = tk.Label(self.sidebar, text="", font=self._FONT_TURN)
         self.turn_label.pack(pady=5)
         self.update_turn_label()
 
+        # AI move delay, kept in sync by the speed slider so turns don't have to query it
+        self._ai_delay_ms = 1000
+
         # Only show AI speed slider if any agent is not human
         if self.agent1_type != "human" or self.agent2_type != "human":
             speed_frame = tk.LabelFrame(self.sidebar, text="AI Speed (ms):")
             speed_frame.pack(pady=10, fill=tk.X, padx=10)
 
             self.speed_slider = tk.Scale(
-                speed_frame, from_=100, to=2000, resolution=100, orient=tk.HORIZONTAL
+                speed_frame,
+                from_=100,
+                to=2000,
+                resolution=100,
+                orient=tk.HORIZONTAL,
+                command=self.set_ai_delay,
             )
-            self.speed_slider.set(1000)  # default
+            self.speed_slider.set(self._ai_delay_ms)  # default
             self.speed_slider.pack(padx=10)
 
         # Instructions for human player (only shows if one player is a human)
+        self.instructions_label = None
         if agent1_type == "human" or agent2_type == "human":
             self.instructions_label = tk.Label(
                 self.sidebar,
-                font=("Helvetica", 11),
+                font=self._FONT_INSTRUCTIONS,
                 text="If you're a human player, click\nany column to drop your disc.",
             )
             self.instructions_label.pack(pady=10)
@@ -162,7 +288,14 @@ class Connect4GUI:
         self.exit_button.pack(pady=5)
         self.exit_button.image = self.exit_icon
 
+        # Tree window itself is only built when first opened
+        self._tree_window = None
+        self._refresh_tree_window = None  # rebuilds the open tree window's contents
+        # Lines hidden behind each collapsed placeholder, by Text widget then tag
+        self._tree_subtrees = {}
+        self.tree_output = None  # embedded tree display, if the layout has one
         if agent1_type == "minimax" or agent2_type == "minimax":
+            self.tree_icon = PhotoImage(file="icons/tree.png")
             self.expand_button = tk.Button(
                 button_frame,
                 text="View Minimax Tree",
@@ -171,66 +304,124 @@ class Connect4GUI:
                 padx=10,
                 pady=5,
                 bg="lightblue",
-                font=("Helvetica", 10, "bold"),
+                font=self._FONT_BUTTON,
                 command=self.open_tree_in_new_window,
             )
             self.expand_button.pack(pady=(10, 0))
             self.expand_button.image = self.tree_icon
 
-        # If Player 1 is AI, autostart after main game screen appears
-        first_agent = agent1_type
-        if first_agent != "human":
-            delay = self.speed_slider.get() if hasattr(self, "speed_slider") else 1000
-            self.root.after(delay, self.play_turn)
+        # If Player 1 is AI, autostart once the game window appears. AI turns
+        # are also picked up again when a minimised window is restored.
+        self.root.bind("<Map>", self._on_map)
+        self.schedule_ai_turn()
 
-        self.game_over = False
+    def _on_map(self, event):
+        """Picks up a pending AI turn when the main window is shown or restored."""
+        # Bindings on the root also get <Map> events from every child widget
+        if event.widget is self.root:
+            self.schedule_ai_turn()
+
+    def set_ai_delay(self, value):
+        """Stores the speed slider's value (passed as a string) as the AI move delay in ms."""
+        self._ai_delay_ms = int(float(value))
 
     def draw_board(self):
-        """Draws the Connect 4 board grid and empty disc slots on the canvas."""
-        for row in range(ROW_COUNT):
-            for col in range(COLUMN_COUNT):
-                # Top left corner of cell
-                x0 = col * 100
-                y0 = row * 100
-
-                # Bottom right corner of cell
-                x1 = x0 + 100
-                y1 = y0 + 100
-
-                # Cell background
-                self.canvas.create_rectangle(x0, y0, x1, y1, fill="blue")
-
-                # White circle for disc slots
-                self.canvas.create_oval(
-                    x0 + 10,
-                    y0 + 10,  # inset top left by 10px
-                    x1 - 10,
-                    y1 - 10,  # inset bottom right
-                    fill="white",
-                    tags=f"cell_{row}_{col}",  # so can update later
+        """Draws the Connect 4 board as a single image on the canvas. Called once per window."""
+        self._init_board_images(self.root)
+
+        self.board_img = PhotoImage(
+            master=self.canvas,
+            width=COLUMN_COUNT * CELL_SIZE,
+            height=ROW_COUNT * CELL_SIZE,
+        )
+        self.board_img.tk.call(self.board_img, "copy", self._EMPTY_BOARD)
+        self.canvas.create_image(0, 0, anchor="nw", image=self.board_img)
+
+        # Colour currently shown in each disc slot, so unchanged slots aren't redrawn
+        self.cells = [["white"] * COLUMN_COUNT for _ in range(ROW_COUNT)]
+
+    @classmethod
+    def _init_board_images(cls, root):
+        """Renders the cell tiles and the empty board the first time a game is opened."""
+        if cls._EMPTY_BOARD is not None:
+            return
+
+        # One blue cell tile per disc colour; moves copy a tile into the board image
+        cls._DISC_TILES = {
+            colour: cls._make_disc_tile(root, colour)
+            for colour in ("white", PLAYER_1_COLOUR, PLAYER_2_COLOUR)
+        }
+
+        # Empty board kept aside so a new game or reset is a single image copy
+        cls._EMPTY_BOARD = PhotoImage(
+            master=root,
+            width=COLUMN_COUNT * CELL_SIZE,
+            height=ROW_COUNT * CELL_SIZE,
+        )
+        for row_coords in CELL_COORDS:
+            for x0, y0, _, _ in row_coords:
+                cls._EMPTY_BOARD.tk.call(
+                    cls._EMPTY_BOARD, "copy", cls._DISC_TILES["white"], "-to", x0, y0
                 )
 
+    @staticmethod
+    def _make_disc_tile(root, colour):
+        """Builds a blue cell image with a disc slot of the given colour, inset 10px from the edges.
+
+        Like the canvas rectangles and ovals it replaces, the cell and the slot have 1px black
+        outlines. Only the top and left cell edges are drawn, since neighbouring cells share the others.
+        """
+        tile = PhotoImage(master=root, width=CELL_SIZE, height=CELL_SIZE)
+        centre = CELL_SIZE / 2
+        radius = CELL_SIZE / 2 - 10
+
+        def pixel(x, y):
+            if x == 0 or y == 0:
+                return "black"  # cell outline
+            distance = ((x + 0.5 - centre) ** 2 + (y + 0.5 - centre) ** 2) ** 0.5
+            if distance <= radius - 1:
+                return colour
+            if distance <= radius:
+                return "black"  # slot outline
+            return "blue"
+
+        # Whole tile in one put: a {...} list of pixel colours per image row
+        rows = []
+        for y in range(CELL_SIZE):
+            pixels = [pixel(x, y) for x in range(CELL_SIZE)]
+            rows.append("{" + " ".join(pixels) + "}")
+        tile.put(" ".join(rows))
+        return tile
+
     def update_disc(self, row, col, symbol):
         """Fills the disc slot at (row, col) with the correct colour based on the player's symbol."""
         colour = PLAYER_1_COLOUR if symbol == self.game.PLAYER_1 else PLAYER_2_COLOUR
-        self.canvas.itemconfig(f"cell_{row}_{col}", fill=colour)
+        if self.cells[row][col] == colour:
+            return
+        self.cells[row][col] = colour
+        x0, y0, _, _ = CELL_COORDS[row][col]
+        self.board_img.tk.call(
+            self.board_img, "copy", self._DISC_TILES[colour], "-to", x0, y0
+        )
 
     def click_handler(self, event):
         """Called when a human clicks the board. Passes the selected column to play_turn()."""
-        agent_type = (
-            self.game.agent1_type if self.turn % 2 == 0 else self.game.agent2_type
-        )
-        if agent_type != "human":
+        agent_type = self._player_info[self.turn & 1][0]
+        if self._input_locked or agent_type != "human":
             return
 
-        col = event.x // 100
-        self.play_turn(col)
+        # Ignore clicks on the canvas border or on a full column
+        x = event.x
+        if 0 <= x < len(COLUMN_AT_X):
+            col = COLUMN_AT_X[x]
+            if self.game.is_valid_move(col):
+                self.play_turn(col)
 
     def show_game_over_message(self, text, colour):
         self.game_over_label = tk.Label(
             self.canvas,
             text=text,
-            font=("Helvetica", 32, "bold"),
+            font=self._FONT_GAME_OVER,
             fg=colour,
             bg="white",
         )
@@ -241,26 +432,53 @@ class Connect4GUI:
         if self.game_over:
             return
 
-        current_player = (
-            self.game.PLAYER_1 if self.turn % 2 == 0 else self.game.PLAYER_2
-        )
-        agent_type = (
-            self.game.agent1_type if self.turn % 2 == 0 else self.game.agent2_type
+        player_index = self.turn & 1
+        agent_move = self._move_fns[player_index]
+
+        # If AI's turn & no column manually selected, search in the background
+        if agent_move is not None and col is None:
+            if self._ai_future is None:
+                _, model, _, _, current_player = self._player_info[player_index]
+                self._start_ai_move(agent_move, current_player, model)
+            return
+
+        self.apply_move(col)
+
+    def _start_ai_move(self, agent_move, symbol, model):
+        """Submits an AI move search to the worker thread; its move is played once the AI delay has passed."""
+        game = self.game
+        future = self._executor.submit(agent_move, game, symbol, model)
+        self._ai_future = future
+
+        # The search runs during the delay, so the first check usually finds it done
+        self._pending_turn = self.root.after(
+            self._ai_delay_ms, self._finish_ai_move, future, game
         )
-        model = self.game.agent1_model if self.turn % 2 == 0 else self.game.agent2_model
-
-        # If AI's turn & no column manually selected
-        if agent_type != "human" and col is None:
-            if agent_type == "random":
-                col = self.game.random_agent()
-            elif agent_type == "smart":
-                col = self.game.smart_agent(current_player)
-            elif agent_type == "minimax":
-                col = self.game.minimax_agent_move(current_player)
-            elif agent_type in ("ml", "minimax_ml"):
-                col = self.game.ml_agent_predict(model)
-            else:
-                return
+
+    def _finish_ai_move(self, future, game):
+        """Plays the AI's move once the search is done. Tk is only touched from the main thread."""
+        if not self._alive:
+            return
+        if not future.done():
+            self._pending_turn = self.root.after(
+                AI_POLL_INTERVAL, self._finish_ai_move, future, game
+            )
+            return
+
+        self._pending_turn = None
+        if future is self._ai_future:
+            self._ai_future = None
+
+        # Drop results for a board that was reset while the AI was thinking
+        if game is not self.game or self.game_over:
+            return
+
+        self.apply_move(future.result())
+
+    def apply_move(self, col):
+        """Drops the current player's disc in the given column, then checks for win/draw."""
+        player_index = self.turn & 1
+        _, _, colour, _, current_player = self._player_info[player_index]
 
         # Invalid or missing column input
         if col is None or not self.game.is_valid_move(col):
@@ -270,29 +488,21 @@ class Connect4GUI:
         row = self.game.get_lowest_empty_row(col)
         self.game.drop_disc(col, current_player)
         self.update_disc(row, col, current_player)
+        self.canvas.update_idletasks()  # paint this disc now, before the next move lands
 
         if self.game.check_winner(current_player):
-            self.canvas.unbind("<Button-1>")
-            player_number = "1" if current_player == self.game.PLAYER_1 else "2"
-            agent_type = (
-                self.game.agent1_type if player_number == "1" else self.game.agent2_type
-            )
-            colour = PLAYER_1_COLOUR if player_number == "1" else PLAYER_2_COLOUR
-
-            # For formatting agent names
-            agent_display = self.AGENT_DISPLAY_NAMES.get(agent_type, agent_type)
+            self._input_locked = True
 
-            self.status_label.config(
-                text=f"Player {player_number}\n({agent_display}) wins!", fg=colour
-            )
+            self.status_label.config(text=self._win_labels[player_index], fg=colour)
             self.turn_label.config(text="")  # clear turn label
-            self.show_game_over_message(f"Player {player_number} Wins!", colour)
+            self.show_game_over_message(self._win_messages[player_index], colour)
             self.root.after(300, self.show_game_stats)
             self.game_over = True
             return
 
         # Check for draw
         if self.game.is_full():
+            self._input_locked = True
             self.status_label.config(text="It's a draw!", fg=DRAW_COLOUR)
             self.turn_label.config(text="")
             self.show_game_over_message("It's a Draw!", DRAW_COLOUR)
@@ -302,33 +512,34 @@ class Connect4GUI:
 
         # Next player's turn
         self.turn += 1
+        self._input_locked = self._player_info[self.turn & 1][0] != "human"
         self.update_turn_label()
 
         # If next player is AI, play their turn after a delay
-        next_agent = (
-            self.game.agent1_type if self.turn % 2 == 0 else self.game.agent2_type
-        )
-        if next_agent != "human":
-            delay = self.speed_slider.get() if hasattr(self, "speed_slider") else 1000
-            self.root.after(delay, self.play_turn)
+        self.schedule_ai_turn()
+
+    def schedule_ai_turn(self):
+        """Starts the next AI turn if it's an AI's turn and the window is visible. The move lands after the speed-slider delay."""
+        if (
+            not self._alive
+            or self.game_over
+            or self._pending_turn is not None
+            or self._ai_future is not None
+            or self._player_info[self.turn & 1][0] == "human"
+        ):
+            return
+
+        # Don't search for a hidden/minimised window; <Map> reschedules on restore
+        if not self.root.winfo_viewable():
+            return
+
+        self.play_turn()
 
     def update_turn_label(self):
         """Updates the sidebar label to show whose turn it is."""
-        if self.turn % 2 == 0:
-            current_player = "Player 1"
-            agent_type = self.game.agent1_type
-            colour = PLAYER_1_COLOUR
-        else:
-            current_player = "Player 2"
-            agent_type = self.game.agent2_type
-            colour = PLAYER_2_COLOUR
-
-        # For formatting agent name
-        agent_display = self.AGENT_DISPLAY_NAMES.get(agent_type, agent_type)
-
-        self.turn_label.config(
-            text=f"{current_player} ({agent_display})'s turn", fg=colour
-        )
+        player_index = self.turn & 1
+        colour = self._player_info[player_index][2]
+        self.turn_label.config(text=self._turn_labels[player_index], fg=colour)
 
     def reset_board(self):
         """Resets the game board and turn counter, keeping the same agents."""
@@ -339,80 +550,219 @@ class Connect4GUI:
             agent2_type=self.agent2_type,
             agent1_model=self.agent1_model,
             agent2_model=self.agent2_model,
+            collect_stats="minimax" in (self.agent1_type, self.agent2_type),
         )
 
-        if hasattr(self, "game_over_label"):
+        self._tree_cache.clear()
+        self._ai_future = None  # any search still running belongs to the old board
+        if self._pending_turn is not None:
+            self.root.after_cancel(self._pending_turn)
+            self._pending_turn = None
+
+        if self.game_over_label is not None:
             self.game_over_label.destroy()
-            del self.game_over_label
+            self.game_over_label = None
 
         # Clear outcome and turn messages
         self.status_label.config(text="")
         self.turn_label.config(text="")
 
-        if hasattr(self, "instructions_label"):
+        if self.instructions_label is not None:
             self.instructions_label.config(
                 text="If you're a human player, click\n any column to drop your disc."
             )
             self.instructions_label.pack()
 
-        # Clear and redraw board
-        self.canvas.delete("all")
-        self.draw_board()
-        self.canvas.bind("<Button-1>", self.click_handler)
+        # Empty every disc slot by copying back the blank board
+        self.board_img.tk.call(self.board_img, "copy", self._EMPTY_BOARD)
+        self.cells = [["white"] * COLUMN_COUNT for _ in range(ROW_COUNT)]
+        self._input_locked = self.agent1_type != "human"
         self.update_turn_label()
 
         self.refresh_minimax_tree()
 
-        if self.agent1_type != "human":
-            delay = self.speed_slider.get() if hasattr(self, "speed_slider") else 1000
-            self.root.after(delay, self.play_turn)
+        self.schedule_ai_turn()
 
     def return_to_start(self):
-        """Closes the game window and returns to the agent selection screen."""
-        self.root.destroy()
-        self.parent_root.deiconify()
+        """Removes the game screen and shows the agent selection screen again."""
+        self.stop_ai()
+        self.frame.destroy()
+        if self.start_screen:
+            self.start_screen.show()
 
     def exit_game(self):
-        """Closes both the game window and the initial setup window."""
+        """Closes the main window, ending the app."""
+        self.stop_ai()
         self.root.destroy()
-        if self.parent_root:
-            self.parent_root.destroy()
 
-    def refresh_minimax_tree(self):
-        """Refreshes the minimax tree display (if applicable) based on the current board state."""
-        if hasattr(self, "tree_output"):
-            self.tree_output.delete("1.0", tk.END)
-
-            # Generate + display their game tree
-            if self.agent1_type == "minimax":
-                self.tree_output.insert(tk.END, "\n=== Player 1 Minimax Tree ===\n\n")
-                best_move, _ = self.game._print_tree_recursive(
-                    self.game.board,  # board_state
-                    SEARCH_DEPTH,
-                    True,  # maximising_player
-                    0,  # indent
-                    -math.inf,
-                    math.inf,
-                    self.game.PLAYER_1,  # player_symbol
-                    self.tree_output,
+    def stop_ai(self):
+        """Stops scheduling AI turns and drops any queued AI work before the window closes."""
+        self._alive = False
+        if self._pending_turn is not None:
+            self.root.after_cancel(self._pending_turn)
+            self._pending_turn = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.root.unbind("<Map>")
+
+    def search_tree_lines(self, game, player_symbol):
+        """Searches and returns the minimax tree lines for a player.
+
+        Subtrees below TREE_PRINT_DEPTH come as (placeholder line, subtree lines) tuples.
+        """
+        # Each player's tree is searched on its own: the player moves first in
+        # their own tree and the heuristic isn't zero-sum (own threes +120,
+        # opponent threes -100), so the other tree's scores can't be negated
+        lines = []
+        game._print_tree_recursive(
+            SEARCH_DEPTH,
+            True,  # maximising_player
+            0,  # indent
+            NEG_INF,
+            POS_INF,
+            player_symbol,
+            lines,
+            TREE_PRINT_DEPTH,
+        )
+        return lines
+
+    def build_tree_view(self, game, cached_trees):
+        """Builds the tree lines for every minimax player, plus the line each player's header starts on.
+
+        cached_trees maps cache keys to trees already rendered for this board; trees
+        that had to be searched are returned by key so the Tk thread can cache them.
+        """
+        lines = []
+        header_lines = {}  # player number -> text line of their tree header
+        searched_trees = {}
+
+        for player_num, (agent_type, _, _, _, symbol) in enumerate(
+            self._player_info, start=1
+        ):
+            if agent_type != "minimax":
+                continue
+            lines.append("\n")
+            # Each collapsed subtree shows as its one placeholder line
+            header_lines[player_num] = 1 + sum(
+                (line if isinstance(line, str) else line[0]).count("\n")
+                for line in lines
+            )
+            lines.append(f"=== Player {player_num} Minimax Tree ===\n\n")
+
+            key = (game.hash, symbol, SEARCH_DEPTH)
+            tree = cached_trees.get(key)
+            if tree is None:
+                tree = searched_trees[key] = self.search_tree_lines(game, symbol)
+            lines.extend(tree)
+
+        return lines, header_lines, searched_trees
+
+    def request_tree_view(self, callback):
+        """Builds the tree view on the AI worker thread and passes (turn, lines, header lines) to callback on the Tk thread."""
+        if not self._alive:
+            return
+
+        # Copy the board only while no AI search is running on it
+        if self._ai_future is not None and not self._ai_future.done():
+            self.root.after(AI_POLL_INTERVAL, self.request_tree_view, callback)
+            return
+
+        game = self.game
+        cached_trees = {
+            key: lines for key, lines in self._tree_cache.items() if key[0] == game.hash
+        }
+        future = self._executor.submit(self.build_tree_view, game.copy(), cached_trees)
+        self.root.after(
+            AI_POLL_INTERVAL, self._finish_tree_view, future, game, self.turn, callback
+        )
+
+    def _finish_tree_view(self, future, game, turn, callback):
+        """Hands a finished tree view to its callback, rebuilding it if the board was reset meanwhile."""
+        if not self._alive:
+            return
+        if not future.done():
+            self.root.after(
+                AI_POLL_INTERVAL, self._finish_tree_view, future, game, turn, callback
+            )
+            return
+
+        if game is not self.game:
+            self.request_tree_view(callback)
+            return
+
+        lines, header_lines, searched_trees = future.result()
+        self._tree_cache.update(searched_trees)
+        callback(turn, lines, header_lines)
+
+    def show_tree_lines(self, text_widget, lines):
+        """Replaces a Text widget's contents with tree lines, showing collapsed subtrees as clickable placeholders."""
+        self._tree_subtrees[text_widget] = (
+            {}
+        )  # placeholder tag -> lines hidden behind it
+        text_widget.tag_config("collapsed", foreground="blue")
+        text_widget.tag_bind(
+            "collapsed",
+            "<Button-1>",
+            lambda event: self.expand_subtree(text_widget, event),
+        )
+
+        # Swap in the new text with a single insert; read-only otherwise
+        text_widget.config(state=tk.NORMAL)
+        text_widget.delete("1.0", tk.END)
+        text_widget.insert(tk.END, *self._tree_insert_args(text_widget, lines))
+        text_widget.config(state=tk.DISABLED)
+
+    def expand_subtree(self, text_widget, event):
+        """Replaces the clicked placeholder with the subtree lines it stands for."""
+        subtrees = self._tree_subtrees[text_widget]
+        for tag in text_widget.tag_names(f"@{event.x},{event.y}"):
+            if tag in subtrees:
+                start, end = text_widget.tag_ranges(tag)
+                text_widget.config(state=tk.NORMAL)
+                text_widget.delete(start, end)
+                text_widget.insert(
+                    start, *self._tree_insert_args(text_widget, subtrees.pop(tag))
                 )
+                text_widget.config(state=tk.DISABLED)
+                break
+        return "break"
+
+    def _tree_insert_args(self, text_widget, lines):
+        """Builds Text.insert arguments for tree lines, tagging each placeholder with its own tag."""
+        subtrees = self._tree_subtrees[text_widget]
+        args = []
+        plain = []
+        for line in lines:
+            if isinstance(line, str):
+                plain.append(line)
+                continue
+            placeholder, subtree = line
+            tag = f"subtree{id(subtree)}"
+            subtrees[tag] = subtree
+            args += ["".join(plain), (), placeholder, ("collapsed", tag)]
+            plain = []
+        args += ["".join(plain), ()]
+        return args
 
-            if self.agent2_type == "minimax":
-                self.tree_output.insert(tk.END, "\n=== Player 2 Minimax Tree ===\n\n")
-                best_move, _ = self.game._print_tree_recursive(
-                    self.game.board,
-                    SEARCH_DEPTH,
-                    True,
-                    0,
-                    -math.inf,
-                    math.inf,
-                    self.game.PLAYER_2,
-                    self.tree_output,
+    def refresh_minimax_tree(self):
+        """Refreshes the minimax tree display (if applicable) based on the current board state."""
+        if self.tree_output is not None:
+            # Build the whole tree off the Tk thread, then show it in one go
+            self.request_tree_view(
+                lambda turn, lines, header_lines: self.show_tree_lines(
+                    self.tree_output, lines
                 )
+            )
 
     def open_tree_in_new_window(self):
-        """Opens a new window to display the full minimax decision tree for one or both players."""
-        new_win = tk.Toplevel(self.root)
+        """Opens a window to display the full minimax decision tree for one or both players, or refreshes the open one."""
+        if self._tree_window is not None and self._tree_window.winfo_exists():
+            self._tree_window.deiconify()
+            self._tree_window.lift()
+            self._refresh_tree_window()
+            return
+
+        new_win = tk.Toplevel(self.frame)
+        self._tree_window = new_win
         new_win.title("Full Minimax Tree")
 
         # Build the text area with a scrollbar
@@ -423,53 +773,33 @@ class Connect4GUI:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         text_widget = tk.Text(
-            text_frame, font=("Courier", 10), wrap=tk.NONE, yscrollcommand=scrollbar.set
+            text_frame, font=self._FONT_TREE, wrap=tk.NONE, yscrollcommand=scrollbar.set
         )
         text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.config(command=text_widget.yview)
 
         # Updates text box with the latest minimax tree(s)
         def refresh_tree_contents():
-            text_widget.delete("1.0", tk.END)
-            text_widget.insert(
-                tk.END,
-                f"Turn {self.turn + 1} — Current Player: {'Player 1' if self.turn % 2 == 0 else 'Player 2'}\n\n",
-            )
+            self.show_tree_lines(text_widget, ["Building minimax tree...\n"])
+            self.request_tree_view(show_tree_view)
 
-            if self.agent1_type == "minimax":
-                text_widget.insert(tk.END, "=== Player 1 Minimax Tree ===\n\n")
-                self.game._print_tree_recursive(
-                    self.game.board,
-                    SEARCH_DEPTH,
-                    True,
-                    0,
-                    -math.inf,
-                    math.inf,
-                    self.game.PLAYER_1,
-                    text_widget,
-                )
+        def show_tree_view(turn, tree_lines, header_lines):
+            if not text_widget.winfo_exists():
+                return  # tree window was closed while the tree was built
+            heading = f"Turn {turn + 1} — Current Player: Player {(turn & 1) + 1}\n"
+            self.show_tree_lines(text_widget, [heading] + tree_lines)
 
-            if self.agent2_type == "minimax":
-                text_widget.insert(tk.END, "\n=== Player 2 Minimax Tree ===\n\n")
-                self.game._print_tree_recursive(
-                    self.game.board,
-                    SEARCH_DEPTH,
-                    True,
-                    0,
-                    -math.inf,
-                    math.inf,
-                    self.game.PLAYER_2,
-                    text_widget,
-                )
+            # Mark each tree's header so jumping to it needs no text search
+            for player_num, line in header_lines.items():
+                text_widget.mark_set(f"player{player_num}_tree", f"{line + 1}.0")
+                text_widget.mark_gravity(f"player{player_num}_tree", tk.LEFT)
 
         # Scrolls straight to the selected player's tree
         def jump_to_player(player_num):
-            tag = f"=== Player {player_num} Minimax Tree ==="
-            index = text_widget.search(tag, "1.0", tk.END)
-            if index:
-                text_widget.see(index)
-                text_widget.mark_set("insert", index)
-                text_widget.focus()
+            mark = f"player{player_num}_tree"
+            text_widget.see(mark)
+            text_widget.mark_set("insert", mark)
+            text_widget.focus()
 
         # Buttons for refresh and jump
         button_frame = tk.Frame(new_win)
@@ -479,20 +809,32 @@ class Connect4GUI:
             button_frame, text="Refresh Tree", command=refresh_tree_contents
         ).pack(side=tk.LEFT, padx=5)
 
-        if self.agent1_type == "minimax":
-            tk.Button(
-                button_frame, text="Jump to Player 1", command=lambda: jump_to_player(1)
-            ).pack(side=tk.LEFT, padx=5)
-        if self.agent2_type == "minimax":
-            tk.Button(
-                button_frame, text="Jump to Player 2", command=lambda: jump_to_player(2)
-            ).pack(side=tk.LEFT, padx=5)
+        for player_num, (agent_type, _, _, _, _) in enumerate(
+            self._player_info, start=1
+        ):
+            if agent_type == "minimax":
+                tk.Button(
+                    button_frame,
+                    text=f"Jump to Player {player_num}",
+                    command=lambda num=player_num: jump_to_player(num),
+                ).pack(side=tk.LEFT, padx=5)
+
+        # Forget the window's collapsed subtrees once it is closed
+        def close_tree_window():
+            self._tree_subtrees.pop(text_widget, None)
+            new_win.destroy()
+
+        new_win.protocol("WM_DELETE_WINDOW", close_tree_window)
 
         # Show tree right away when the window opens
+        self._refresh_tree_window = refresh_tree_contents
         refresh_tree_contents()
 
     def show_game_stats(self):
         """Displays game statistics in a popup window after match ends."""
+        if not self._alive:
+            return  # game screen was closed before the popup was due
+
         moves_played = self.turn + 1
 
         stats_lines = [f"Moves played: {moves_played}"]
@@ -503,19 +845,15 @@ class Connect4GUI:
                 f"Maximum search depth reached: {self.game.search_depth_used}"
             )
 
-            if self.game.branching_factors:
-                avg_branching = sum(self.game.branching_factors) / len(
-                    self.game.branching_factors
-                )
+            if self.game.branching_samples:
+                avg_branching = self.game.average_branching_factor
                 stats_lines.append(f"Average branching factor: {avg_branching:.2f}")
 
-            if self.game.heuristic_deltas:
-                avg_heuristic = sum(self.game.heuristic_deltas) / len(
-                    self.game.heuristic_deltas
-                )
+            if self.game.heuristic_delta_samples:
+                avg_heuristic = self.game.average_heuristic_delta
                 stats_lines.append(f"Average heuristic delta: {avg_heuristic:.2f}")
 
-        stats_window = tk.Toplevel(self.root)
+        stats_window = tk.Toplevel(self.frame)
         stats_window.title("Game Stats")
         stats_window.geometry("320x300")
         stats_window.resizable(False, False)
@@ -523,23 +861,19 @@ class Connect4GUI:
         title_label = tk.Label(
             stats_window,
             text="Game Statistics",
-            font=("Helvetica", 16, "bold"),
+            font=self._FONT_STATS_TITLE,
             fg="darkblue",
         )
         title_label.pack(pady=(15, 10))
 
-        stats_frame = tk.Frame(stats_window)
-        stats_frame.pack(padx=20, pady=10)
-
-        for line in stats_lines:
-            stat_label = tk.Label(
-                stats_frame,
-                text=line,
-                font=("Helvetica", 12),
-                anchor="w",
-                justify="left",
-            )
-            stat_label.pack(anchor="w")
+        stats_label = tk.Label(
+            stats_window,
+            text="\n".join(stats_lines),
+            font=self._FONT_STATS,
+            anchor="w",
+            justify="left",
+        )
+        stats_label.pack(padx=20, pady=10)
 
         close_button = tk.Button(
             stats_window, text="Close", command=stats_window.destroy
@@ -547,25 +881,27 @@ class Connect4GUI:
         close_button.pack(pady=15)
 
 
-AGENT_OPTIONS = [
-    "Human",
-    "Random Agent",
-    "Smart Agent",
-    "Minimax Agent",
-    "Basic ML Agent",
-    "Minimax-Trained ML Agent",
-]
+# Agent types offered on the start screen, as (internal type, menu label)
+AGENTS = (
+    ("human", "Human"),
+    ("random", "Random Agent"),
+    ("smart", "Smart Agent"),
+    ("minimax", "Minimax Agent"),
+    ("ml", "Basic ML Agent"),
+    ("minimax_ml", "Minimax-Trained ML Agent"),
+)
+AGENT_OPTIONS = [label for _, label in AGENTS]
+_AGENT_TYPES = {label: agent_type for agent_type, label in AGENTS}
 
 
 class StartScreen:
     def __init__(self, root, start_callback):
         """Sets up the initial agent selection screen and game launch button."""
         self.root = root
-        self.root.minsize(width=300, height=300)
         self.start_callback = start_callback
 
         self.frame = tk.Frame(root)
-        self.frame.pack(pady=50)
+        self.show()
 
         tk.Label(self.frame, text="Connect 4", font=("Helvetica", 24)).pack(pady=10)
 
@@ -593,7 +929,15 @@ class StartScreen:
 
     def start_game(self):
         """Reads the selected agent types and launches the game GUI."""
-        agent1 = self.agent1_var.get()
-        agent2 = self.agent2_var.get()
-        self.root.withdraw()
-        self.start_callback(agent1, agent2)
+        agent1_type = _AGENT_TYPES[self.agent1_var.get()]
+        agent2_type = _AGENT_TYPES[self.agent2_var.get()]
+        self.frame.pack_forget()
+        self.start_callback(agent1_type, agent2_type)
+
+    def show(self):
+        """Shows the start screen in the main window, e.g. when returning from a game."""
+        self.root.title("Connect 4 Setup")
+        self.root.minsize(width=300, height=300)
+        self.root.geometry("")  # shrink back to fit the start screen
+        self.root.protocol("WM_DELETE_WINDOW", self.root.destroy)
+        self.frame.pack(pady=50)
@@ -8,7 +8,9 @@ win/draw checking, and AI agent behaviour. It supports multiple agent types:
 - Minimax with alpha-beta pruning
 - ML-based agents (trained on UCI data or minimax-generated decisions)
 
-It also includes board evaluation functions and a minimax tree visualiser.
+The board is stored as a pair of bitboards (one per player), so win checks and
+move generation are a handful of integer operations. It also includes board
+evaluation functions and a minimax tree visualiser.
 This logic is reused in both the GUI and performance evaluation scripts.
 Running this file directly will launch the full graphical interface.
 Run this script with `python game.py` to start the game.
@@ -17,17 +19,161 @@ General Reference:
 - Keith Galli - Connect 4 AI (GitHub)
     https://github.com/KeithGalli/Connect4-Python/blob/master/connect4_with_ai.py
     Used as a reference for structuring minimax, alpha-beta pruning, and evaluation heuristics.
+- Pascal Pons - Solving Connect 4: Bitboard
+    http://blog.gamesolver.org/solving-connect-four/06-bitboard/
+    Used as a reference for the bitboard layout and shift-based win detection.
 """
 
+import copy
 import random
-import math
 import tkinter as tk
 from config import ROW_COUNT, COLUMN_COUNT, SEARCH_DEPTH
 
+# Bitboard layout: each column takes ROW_COUNT + 1 bits, numbered bottom to top.
+# The extra (sentinel) bit per column stays empty so shifted lines never wrap
+# into the next column. Cell (row, col) with row 0 at the top maps to bit
+# col * BOARD_HEIGHT + (ROW_COUNT - 1 - row).
+BOARD_HEIGHT = ROW_COUNT + 1
+TOP_MASK = [1 << (ROW_COUNT - 1 + col * BOARD_HEIGHT) for col in range(COLUMN_COUNT)]
+COLUMN_MASK = [
+    ((1 << ROW_COUNT) - 1) << (col * BOARD_HEIGHT) for col in range(COLUMN_COUNT)
+]
+BOARD_MASK = sum(COLUMN_MASK)
+TOP_ROW_MASK = sum(TOP_MASK)
+BOTTOM_MASK = sum(1 << (col * BOARD_HEIGHT) for col in range(COLUMN_COUNT))
+
+# Single-bit mask of each cell, indexed [row][col] like the displayed board
+CELL_BITS = [
+    [1 << (col * BOARD_HEIGHT + ROW_COUNT - 1 - row) for col in range(COLUMN_COUNT)]
+    for row in range(ROW_COUNT)
+]
+
+# Shift between neighbouring cells for each direction, in check_winner's order
+WIN_DIRECTIONS = (
+    ("horizontal", BOARD_HEIGHT),
+    ("vertical", 1),
+    ("diagonal", BOARD_HEIGHT + 1),  # bottom left -> top right
+    ("diagonal", BOARD_HEIGHT - 1),  # bottom right -> top left
+)
+
+
+def _has_four(position):
+    """Returns True if a player's bitboard holds four in a row in any direction."""
+    # Keep cells that have a same-coloured neighbour, then pairs that line up into four
+    pairs = position & (position >> BOARD_HEIGHT)  # horizontal
+    if pairs & (pairs >> 2 * BOARD_HEIGHT):
+        return True
+    pairs = position & (position >> 1)  # vertical
+    if pairs & (pairs >> 2):
+        return True
+    pairs = position & (position >> (BOARD_HEIGHT + 1))  # diagonal /
+    if pairs & (pairs >> 2 * (BOARD_HEIGHT + 1)):
+        return True
+    pairs = position & (position >> (BOARD_HEIGHT - 1))  # diagonal \
+    return bool(pairs & (pairs >> 2 * (BOARD_HEIGHT - 1)))
+
+
+def _threat_cells(position):
+    """Returns a bitboard of every cell that would complete four in a row for this position."""
+    # Vertical: three stacked discs directly below the cell
+    threats = (position << 1) & (position << 2) & (position << 3)
+
+    for shift in (BOARD_HEIGHT, BOARD_HEIGHT + 1, BOARD_HEIGHT - 1):
+        # Two discs on one side of the cell, plus a third beyond them or opposite
+        pair = (position << shift) & (position << 2 * shift)
+        threats |= pair & (position << 3 * shift)
+        threats |= pair & (position >> shift)
+        pair = (position >> shift) & (position >> 2 * shift)
+        threats |= pair & (position << shift)
+        threats |= pair & (position >> 3 * shift)
+
+    return threats
+
+
+def _window_mask(cells):
+    """Builds a bitboard mask from (row, col) cells, with row 0 at the top."""
+    return sum(CELL_BITS[row][col] for row, col in cells)
+
+
+# Every line of four cells on the board: horizontal, vertical, then both diagonals
+WINDOW_MASKS = (
+    [
+        _window_mask((row, col + i) for i in range(4))
+        for row in range(ROW_COUNT)
+        for col in range(COLUMN_COUNT - 3)
+    ]
+    + [
+        _window_mask((row + i, col) for i in range(4))
+        for col in range(COLUMN_COUNT)
+        for row in range(ROW_COUNT - 3)
+    ]
+    + [
+        _window_mask((row - i, col + i) for i in range(4))
+        for row in range(3, ROW_COUNT)
+        for col in range(COLUMN_COUNT - 3)
+    ]
+    + [
+        _window_mask((row - i, col - i) for i in range(4))
+        for row in range(3, ROW_COUNT)
+        for col in range(3, COLUMN_COUNT)
+    ]
+)
+
+# Windows through each bit position: the only ones a disc placed there can rescore
+CELL_WINDOWS = [
+    tuple(window for window in WINDOW_MASKS if window >> index & 1)
+    for index in range(COLUMN_COUNT * BOARD_HEIGHT)
+]
+
+# Random 64-bit Zobrist keys per bit position (one table per player). The mirrored
+# tables hold the key of the horizontally reflected cell, so mirror images of a
+# board can share transposition table entries.
+_zobrist_rng = random.Random(0)
+ZOBRIST_KEYS = [
+    [_zobrist_rng.getrandbits(64) for _ in range(COLUMN_COUNT * BOARD_HEIGHT)]
+    for _ in range(2)
+]
+MIRROR_ZOBRIST_KEYS = [
+    [
+        keys[
+            (COLUMN_COUNT - 1 - index // BOARD_HEIGHT) * BOARD_HEIGHT
+            + index % BOARD_HEIGHT
+        ]
+        for index in range(COLUMN_COUNT * BOARD_HEIGHT)
+    ]
+    for keys in ZOBRIST_KEYS
+]
+
+# Transposition table entry flags: stored value is exact, a lower bound, or an upper bound
+TT_EXACT, TT_LOWER, TT_UPPER = 0, 1, 2
+
+# Alpha-beta window bounds, bound once instead of looked up or parsed per node
+NEG_INF = float("-inf")
+POS_INF = float("inf")
+
+# Open columns for each set of full columns, keyed by the board's mask & TOP_ROW_MASK
+LEGAL_COLUMNS = {
+    sum(TOP_MASK[col] for col in range(COLUMN_COUNT) if full >> col & 1): tuple(
+        col for col in range(COLUMN_COUNT) if not full >> col & 1
+    )
+    for full in range(1 << COLUMN_COUNT)
+}
+
+# Columns ordered centre-out, e.g. (3, 2, 4, 1, 5, 0, 6) for 7 columns
+MOVE_ORDER = tuple(
+    sorted(range(COLUMN_COUNT), key=lambda col: abs(col - COLUMN_COUNT // 2))
+)
+
 
 class Connect4:
     PLAYER_1 = "●"
     PLAYER_2 = "○"
+    OPPONENT = {PLAYER_1: PLAYER_2, PLAYER_2: PLAYER_1}
+    ZOBRIST = {PLAYER_1: ZOBRIST_KEYS[0], PLAYER_2: ZOBRIST_KEYS[1]}
+    MIRROR_ZOBRIST = {
+        PLAYER_1: MIRROR_ZOBRIST_KEYS[0],
+        PLAYER_2: MIRROR_ZOBRIST_KEYS[1],
+    }
 
     # Create empty 6x7 board
     def __init__(
@@ -36,105 +182,180 @@ class Connect4:
         agent2_type="ml",
         agent1_model=None,
         agent2_model=None,
+        collect_stats=False,
     ):
-        self.board = [[" " for _ in range(COLUMN_COUNT)] for _ in range(ROW_COUNT)]
+        # One bitboard per player plus a mask of all occupied cells
+        self.bitboards = {self.PLAYER_1: 0, self.PLAYER_2: 0}
+        self.mask = 0
+        self.heights = [0] * COLUMN_COUNT  # discs in each column
+
+        # Zobrist hashes of the board and its mirror image, updated on every drop
+        self.hash = 0
+        self.mirror_hash = 0
+
         self.agent1_type = agent1_type
         self.agent2_type = agent2_type
         self.agent1_model = agent1_model  # model for Player 1 (if ML)
         self.agent2_model = agent2_model  # model for Player 2 (if ML)
 
-        # Stats for minimax performance
+        # Stats for minimax performance, only recorded when collect_stats is set
+        self.collect_stats = collect_stats
+        self.reset_stats()
+
+        # Best move found at each remaining depth by the last tree search, tried first next time
+        self.pv = {}
+
+        # Transposition table: (board hash, player, maximising) -> (depth, flag, score, best move)
+        # Kept for the whole game so repeated tree searches reuse earlier results
+        self.tt = {}
+
+        # Same layout for minimax_agent, keyed by the AI's symbol since it scores from one side
+        self.search_tt = {}
+
+        # Moves that caused a cutoff: the last two per ply (discs on the board), and a
+        # per-player score per column weighted towards cutoffs found by deeper searches
+        self.killers = {}
+        self.history = {
+            self.PLAYER_1: [0] * COLUMN_COUNT,
+            self.PLAYER_2: [0] * COLUMN_COUNT,
+        }
+
+    def reset_stats(self):
+        """Clears the minimax stats. Averages are kept as running totals and sample counts."""
         self.nodes_expanded = 0
         self.search_depth_used = 0
-        self.branching_factors = []  # valid moves per turn
-        self.heuristic_deltas = []  # score changes per move
+        self.branching_total = 0  # valid moves per node, summed
+        self.branching_samples = 0
+        self.heuristic_delta_total = 0  # score changes per move, summed
+        self.heuristic_delta_samples = 0
+
+    @property
+    def average_branching_factor(self):
+        """Average number of valid moves per searched node (0 if nothing was searched)."""
+        if not self.branching_samples:
+            return 0
+        return self.branching_total / self.branching_samples
+
+    @property
+    def average_heuristic_delta(self):
+        """Average change in evaluation made by the minimax agent's moves (0 if none were made)."""
+        if not self.heuristic_delta_samples:
+            return 0
+        return self.heuristic_delta_total / self.heuristic_delta_samples
+
+    @property
+    def board(self):
+        """Decodes the bitboards into a grid of symbols (row 0 is the top), as used by the GUI and ML agents."""
+        player_1 = self.bitboards[self.PLAYER_1]
+        player_2 = self.bitboards[self.PLAYER_2]
+        return [
+            [
+                (
+                    self.PLAYER_1
+                    if player_1 & bit
+                    else self.PLAYER_2 if player_2 & bit else " "
+                )
+                for bit in row_bits
+            ]
+            for row_bits in CELL_BITS
+        ]
 
     def drop_disc(self, column, player_symbol):
         """Places the player's disc in the chosen column if possible. Returns True if successful."""
-        row = self.get_lowest_empty_row(column)
-        if row is not None:
-            self.board[row][column] = player_symbol
-            return True
-        return False
+        if not self.is_valid_move(column):
+            return False
+        index = column * BOARD_HEIGHT + self.heights[column]
+        move = 1 << index
+        self.bitboards[player_symbol] |= move
+        self.mask |= move
+        self.heights[column] += 1
+        self.hash ^= self.ZOBRIST[player_symbol][index]
+        self.mirror_hash ^= self.MIRROR_ZOBRIST[player_symbol][index]
+        return True
+
+    def _undo_drop(self, column, player_symbol):
+        """Removes the top disc from a column. Used to undo simulated moves."""
+        self.heights[column] -= 1
+        index = column * BOARD_HEIGHT + self.heights[column]
+        move = 1 << index
+        self.bitboards[player_symbol] ^= move
+        self.mask ^= move
+        self.hash ^= self.ZOBRIST[player_symbol][index]
+        self.mirror_hash ^= self.MIRROR_ZOBRIST[player_symbol][index]
+
+    def copy(self):
+        """Returns a copy of the board that can be searched separately.
+
+        Agents and search tables are shared with the original, so only one of them may be searched at a time.
+        """
+        board = copy.copy(self)
+        board.bitboards = dict(self.bitboards)
+        board.heights = list(self.heights)
+        return board
 
     def is_valid_move(self, column):
         """Returns True if the selected column has at least one empty slot."""
-        return self.board[0][column] == " "
+        return (self.mask & TOP_MASK[column]) == 0
 
     def check_winner(self, player_symbol):
         """Checks the board for a winning condition (horizontal, vertical, or diagonal) for the given player."""
-        # Check horizontal win -
-        for row in range(ROW_COUNT):
-            for col in range(COLUMN_COUNT - 3):  # avoid out of bounds
-                if all(self.board[row][col + i] == player_symbol for i in range(4)):
-                    return "horizontal"
-
-        # Check vertical win |
-        for col in range(COLUMN_COUNT):
-            for row in range(ROW_COUNT - 3):  # avoid out of bounds
-                if all(self.board[row + i][col] == player_symbol for i in range(4)):
-                    return "vertical"
-
-        # Check diagonal win /
-        for row in range(3, ROW_COUNT):  # start from row 3 to stay in bounds
-            for col in range(COLUMN_COUNT - 3):
-                # Bottom left -> top right
-                if all(self.board[row - i][col + i] == player_symbol for i in range(4)):
-                    return "diagonal"
-
-        # Check diagonal win \
-        for row in range(3, ROW_COUNT):
-            for col in range(3, COLUMN_COUNT):
-                # Bottom-right -> top-left
-                if all(self.board[row - i][col - i] == player_symbol for i in range(4)):
-                    return "diagonal"
+        position = self.bitboards[player_symbol]
+        for win_type, shift in WIN_DIRECTIONS:
+            # Keep cells that have a same-coloured neighbour, then pairs that line up into four
+            pairs = position & (position >> shift)
+            if pairs & (pairs >> 2 * shift):
+                return win_type
 
         return None  # no winner
 
+    def count_threats(self, player_symbol):
+        """Counts empty cells that would complete four in a row for the given player."""
+        threats = _threat_cells(self.bitboards[player_symbol])
+        return (threats & (BOARD_MASK ^ self.mask)).bit_count()
+
     def is_full(self):
         """Returns True if the board has no empty slots left (i.e., a draw)."""
-        return all(self.board[0][col] != " " for col in range(COLUMN_COUNT))
+        return self.mask == BOARD_MASK
 
     def evaluate_board(self, player_symbol):
         """Scores the board from the given player's perspective using heuristics. Higher is better for the player."""
-        opponent_symbol = (
-            self.PLAYER_1 if player_symbol == self.PLAYER_2 else self.PLAYER_2
-        )
+        opponent_symbol = self.OPPONENT[player_symbol]
+        position = self.bitboards[player_symbol]
+        opponent_position = self.bitboards[opponent_symbol]
         score = 0
 
-        # Horizontal patterns
-        for row in range(ROW_COUNT):
-            for col in range(COLUMN_COUNT - 3):
-                window = [self.board[row][col + i] for i in range(4)]
-                score += self.assess_pattern(player_symbol, opponent_symbol, window)
-
-        # Vertical patterns
-        for col in range(COLUMN_COUNT):
-            for row in range(ROW_COUNT - 3):
-                window = [self.board[row + i][col] for i in range(4)]
-                score += self.assess_pattern(player_symbol, opponent_symbol, window)
-
-        # Diagonal / patterns
-        for row in range(3, ROW_COUNT):
-            for col in range(COLUMN_COUNT - 3):
-                window = [self.board[row - i][col + i] for i in range(4)]
-                score += self.assess_pattern(player_symbol, opponent_symbol, window)
-
-        # Diagonal \ patterns
-        for row in range(3, ROW_COUNT):
-            for col in range(3, COLUMN_COUNT):
-                window = [self.board[row - i][col - i] for i in range(4)]
-                score += self.assess_pattern(player_symbol, opponent_symbol, window)
+        # Count each player's discs in every window straight from the bitboards
+        for window in WINDOW_MASKS:
+            score += WINDOW_SCORES[(position & window).bit_count()][
+                (opponent_position & window).bit_count()
+            ]
 
         return score
 
+    def evaluate_move_delta(self, column, player_symbol):
+        """Returns how much evaluate_board would change if the player dropped a disc in the column."""
+        opponent_symbol = self.OPPONENT[player_symbol]
+        position = self.bitboards[player_symbol]
+        opponent_position = self.bitboards[opponent_symbol]
+        delta = 0
+
+        # Only windows through the new disc gain a player disc, so rescore just those
+        for window in CELL_WINDOWS[column * BOARD_HEIGHT + self.heights[column]]:
+            player_count = (position & window).bit_count()
+            opponent_count = (opponent_position & window).bit_count()
+            delta += (
+                WINDOW_SCORES[player_count + 1][opponent_count]
+                - WINDOW_SCORES[player_count][opponent_count]
+            )
+
+        return delta
+
     # A window = sequence of 4 connected cells
-    def assess_pattern(self, player_symbol, opponent_symbol, window):
-        """Evaluates a group of four cells and assigns a score based on potential threats or advantages."""
+    @staticmethod
+    def assess_pattern(player_count, opponent_count):
+        """Evaluates a group of four cells (given each player's disc count) and assigns a score based on potential threats or advantages."""
         score = 0
-        opponent_count = window.count(opponent_symbol)
-        player_count = window.count(player_symbol)
-        empty_count = window.count(" ")
+        empty_count = 4 - player_count - opponent_count
 
         # Penalise strong opponent patterns
         if opponent_count == 4:  # opponent wins
@@ -167,40 +388,82 @@ class Connect4:
     def minimax_agent(self, alpha, beta, maximising_player, depth, ai_symbol):
         """Recursive minimax algorithm with alpha-beta pruning to choose the best move for the AI."""
         # Track search stats
-        self.search_depth_used = max(self.search_depth_used, depth)
-        self.nodes_expanded += 1
-
-        # Find all columns where move is possible (not full)
-        valid_moves = [col for col in range(COLUMN_COUNT) if self.is_valid_move(col)]
+        if self.collect_stats:
+            self.nodes_expanded += 1
+
+        opponent_symbol = self.OPPONENT[ai_symbol]
+
+        if _has_four(self.bitboards[ai_symbol]):
+            return None, POS_INF  # player wins
+        elif _has_four(self.bitboards[opponent_symbol]):
+            return None, NEG_INF  # opponent wins
+
+        # Leaves (most of the visited nodes) only need scoring
+        if depth == 0:
+            # Track branching factor: columns whose top cell is still empty
+            if self.collect_stats:
+                self.branching_total += (
+                    COLUMN_COUNT - (self.mask & TOP_ROW_MASK).bit_count()
+                )
+                self.branching_samples += 1
+            return None, self.evaluate_board(ai_symbol)
 
-        opponent_symbol = self.PLAYER_1 if ai_symbol == self.PLAYER_2 else self.PLAYER_2
+        # Reuse an earlier result for this position if it was searched at least as deep
+        tt_key = self._tt_key(ai_symbol, maximising_player)
+        hit, tt_move, score = self._tt_probe(self.search_tt, tt_key, depth, alpha, beta)
+        if hit:
+            return tt_move, score
 
-        if self.check_winner(ai_symbol):
-            return None, float("inf")  # player wins
-        elif self.check_winner(opponent_symbol):
-            return None, float("-inf")  # opponent wins
+        # Find all columns where move is possible (not full), centre first
+        valid_moves = [col for col in MOVE_ORDER if self.is_valid_move(col)]
 
         # Track branching factor
-        self.branching_factors.append(len(valid_moves))
+        if self.collect_stats:
+            self.branching_total += len(valid_moves)
+            self.branching_samples += 1
+
+        # Stop search if board is full (no valid moves left)
+        if not valid_moves:
+            score = self.evaluate_board(ai_symbol)
+            self._tt_store(self.search_tt, tt_key, depth, score, None)
+            return None, score
 
-        # Sort moves (centre first)
-        priority_order = [3, 2, 4, 1, 5, 0, 6]
-        valid_moves = sorted(valid_moves, key=lambda col: priority_order.index(col))
+        # A board that is its own mirror image (e.g. the opening) scores each column the same
+        # as its reflection, so only the left half and centre need searching
+        if self.hash == self.mirror_hash:
+            valid_moves = [col for col in valid_moves if col <= COLUMN_COUNT // 2]
+
+        # Order moves: stored best move, then this ply's killer moves, then history, then centre-out
+        current_symbol = ai_symbol if maximising_player else opponent_symbol
+        killers = self.killers.get(self.mask.bit_count(), ())
+        history = self.history[current_symbol]
+        valid_moves.sort(
+            key=lambda col: (col != tt_move, col not in killers, -history[col])
+        )
 
-        # Stop search if depth limit reached or board is full
-        if depth == 0 or self.is_full():
-            return None, self.evaluate_board(ai_symbol)
+        # Ahead of all of those, a move that wins outright or blocks the other side's win
+        # (skipped just above the leaves, where the check costs more than it saves)
+        if depth > 1:
+            playable = (self.mask + BOTTOM_MASK) & BOARD_MASK
+            forced = _threat_cells(self.bitboards[current_symbol]) & playable or (
+                _threat_cells(self.bitboards[self.OPPONENT[current_symbol]]) & playable
+            )
+            if forced:
+                forced_move = ((forced & -forced).bit_length() - 1) // BOARD_HEIGHT
+                valid_moves.remove(forced_move)
+                valid_moves.insert(0, forced_move)
+
+        alpha_orig, beta_orig = alpha, beta
 
         if maximising_player:
-            best_score = float("-inf")
+            best_score = NEG_INF
             best_move = None
             for col in valid_moves:
-                row = self.get_lowest_empty_row(col)
-                self.board[row][col] = ai_symbol
+                self.drop_disc(col, ai_symbol)
                 _, score = self.minimax_agent(
                     alpha, beta, False, depth - 1, ai_symbol
                 )  # simulate to see how opponent would respond
-                self.board[row][col] = " "  # undo move
+                self._undo_drop(col, ai_symbol)  # undo move
 
                 if score > best_score:
                     best_score = score
@@ -209,19 +472,17 @@ class Connect4:
 
                 # Prune branch
                 if alpha >= beta:
+                    self._record_cutoff(col, ai_symbol, depth)
                     break
-
-            return best_move, best_score
         else:
-            best_score = float("inf")  # start high since opponent is minimising
+            best_score = POS_INF  # start high since opponent is minimising
             best_move = None
 
             # Try all valid opponent moves
             for col in valid_moves:
-                row = self.get_lowest_empty_row(col)
-                self.board[row][col] = opponent_symbol  # opponent makes move
+                self.drop_disc(col, opponent_symbol)  # opponent makes move
                 _, score = self.minimax_agent(alpha, beta, True, depth - 1, ai_symbol)
-                self.board[row][col] = " "  # undo move
+                self._undo_drop(col, opponent_symbol)  # undo move
 
                 # Opponent chooses move that lowest player's score the most
                 if score < best_score:
@@ -230,35 +491,86 @@ class Connect4:
 
                 beta = min(beta, best_score)
                 if alpha >= beta:
+                    self._record_cutoff(col, opponent_symbol, depth)
                     break
 
-            return best_move, best_score
+        self._tt_store(
+            self.search_tt, tt_key, depth, best_score, best_move, alpha_orig, beta_orig
+        )
 
-    def minimax_agent_move(self, ai_symbol):
-        """Returns the best move for the AI using minimax, while logging heuristic delta for analysis."""
-        best_move, _ = self.minimax_agent(
-            -math.inf, math.inf, True, SEARCH_DEPTH, ai_symbol
+        return best_move, best_score
+
+    def _tt_key(self, player_symbol, maximising_player):
+        """Returns the transposition table key of the board. Mirror images score the same, so both share one key."""
+        return (min(self.hash, self.mirror_hash), player_symbol, maximising_player)
+
+    def _tt_probe(self, table, key, depth, alpha, beta):
+        """Looks the board up in a transposition table, returning (hit, best move, score).
+
+        hit is True when the stored result was searched at least `depth` deep and settles the
+        (alpha, beta) window. The best move comes back even on a miss, for move ordering.
+        """
+        entry = table.get(key)
+        if entry is None:
+            return False, None, None
+
+        entry_depth, flag, score, move = entry
+        # Moves are stored for the smaller-hash orientation of the board
+        if move is not None and self.mirror_hash < self.hash:
+            move = COLUMN_COUNT - 1 - move
+        hit = entry_depth >= depth and (
+            flag == TT_EXACT
+            or (flag == TT_LOWER and score >= beta)
+            or (flag == TT_UPPER and score <= alpha)
         )
+        return hit, move, score
 
-        if best_move is not None:
-            score_before = self.evaluate_board(ai_symbol)
+    def _tt_store(
+        self, table, key, depth, score, move, alpha_orig=NEG_INF, beta_orig=POS_INF
+    ):
+        """Stores a search result, flagged by whether the score is exact or only a bound from a pruned search."""
+        if score <= alpha_orig:
+            flag = TT_UPPER
+        elif score >= beta_orig:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        if move is not None and self.mirror_hash < self.hash:
+            move = COLUMN_COUNT - 1 - move
+        table[key] = (depth, flag, score, move)
+
+    def _record_cutoff(self, column, player_symbol, depth):
+        """Remembers a move that pruned its siblings, so it is tried early in similar positions."""
+        killers = self.killers.setdefault(self.mask.bit_count(), [None, None])
+        if killers[0] != column:
+            killers[1] = killers[0]
+            killers[0] = column
+        self.history[player_symbol][column] += depth * depth
 
-            row = self.get_lowest_empty_row(best_move)
-            self.board[row][best_move] = ai_symbol
+    def minimax_agent_move(self, ai_symbol):
+        """Returns the best move for the AI using minimax, while logging heuristic delta for analysis.
 
-            # Evaluate board after simulating the move
-            score_after = self.evaluate_board(ai_symbol)
-            delta = score_after - score_before
-            self.heuristic_deltas.append(delta)
+        Searches one ply deeper each iteration so the transposition table can order the next one.
+        """
+        for depth in range(1, SEARCH_DEPTH + 1):
+            best_move, _ = self.minimax_agent(NEG_INF, POS_INF, True, depth, ai_symbol)
 
-            self.board[row][best_move] = " "  # undo move after evaluation
+        if self.collect_stats:
+            # The root is the deepest point any search starts from
+            self.search_depth_used = max(self.search_depth_used, depth)
 
+        if best_move is not None:
+            if self.collect_stats:
+                self.heuristic_delta_total += self.evaluate_move_delta(
+                    best_move, ai_symbol
+                )
+                self.heuristic_delta_samples += 1
             return best_move
         return self.random_agent()
 
     def random_agent(self):
         """Returns a random valid column for the next move."""
-        valid_moves = [col for col in range(COLUMN_COUNT) if self.is_valid_move(col)]
+        valid_moves = LEGAL_COLUMNS[self.mask & TOP_ROW_MASK]
 
         if valid_moves:
             chosen_move = random.choice(valid_moves)
@@ -267,20 +579,18 @@ class Connect4:
 
     # Check if player can win this turn
     def find_winning_move(self, player_symbol):
-        for col in range(COLUMN_COUNT):
-            if self.is_valid_move(col):
-                row = self.get_lowest_empty_row(col)
-                if row is not None:
-                    self.board[row][col] = player_symbol  # place disc temporarily
-                    if self.check_winner(player_symbol):
-                        self.board[row][col] = " "  # undo move
-                        return col  # winning column
-                    self.board[row][col] = " "
-        return None
+        # Adding a bit at each column's bottom carries up to its lowest empty cell
+        playable = (self.mask + BOTTOM_MASK) & BOARD_MASK
+        wins = _threat_cells(self.bitboards[player_symbol]) & playable
+        if not wins:
+            return None
+        return (
+            (wins & -wins).bit_length() - 1
+        ) // BOARD_HEIGHT  # leftmost winning column
 
     def smart_agent(self, ai_symbol):
         """Tries to win in one move or block the opponent if they can win next turn. Falls back to random otherwise."""
-        opponent_symbol = self.PLAYER_1 if ai_symbol == self.PLAYER_2 else self.PLAYER_2
+        opponent_symbol = self.OPPONENT[ai_symbol]
 
         # Try to win
         winning_move = self.find_winning_move(ai_symbol)
@@ -296,20 +606,41 @@ class Connect4:
         return self.random_agent()
 
     def ml_agent_predict(self, model):
-        """Uses a trained ML model to predict the best move. Defaults to a random move if the prediction is invalid."""
-        flat_board = [self.convert_symbol(cell) for row in self.board for cell in row]
-
-        # Predict best column using a trained ML model
-        prediction = model.predict([flat_board])[0]
-
-        # Ensure column index is an integer
-        column = int(prediction)
-
-        # Make sure the predicted move is valid
-        if self.is_valid_move(column):
-            return column
-        else:
-            return self.random_agent()  # if column is full
+        """Uses a trained ML model to predict the best move. Falls back to the next most likely valid column, then to a random move."""
+        column = self.ml_agent_predict_batch(model, [self.get_features()])[0]
+        if column is None:
+            return self.random_agent()  # if every predicted column is full
+        return column
+
+    def ml_agent_predict_batch(self, model, boards):
+        """Predicts a column for each encoded board (see get_features) with a single model call.
+
+        Each board gets its most likely column that still has room, or None if every predicted column is full.
+        """
+        # Score every column the model knows, for all boards at once
+        probabilities = model.predict_proba(boards)
+        # Column of each probability, as integers
+        classes = [int(label) for label in model.classes_]
+
+        columns = []
+        for board, board_probabilities in zip(boards, probabilities):
+            # Try columns from most to least likely (ties keep the model's class order, like predict).
+            # A column has room while its top cell (the board's first row) is empty
+            ranked = sorted(range(len(classes)), key=lambda i: -board_probabilities[i])
+            columns.append(
+                next((classes[i] for i in ranked if board[classes[i]] == 0), None)
+            )
+        return columns
+
+    def get_features(self):
+        """Encodes the board for the ML models, row by row from the top (1 = Player 1, -1 = Player 2, 0 = empty)."""
+        player_1 = self.bitboards[self.PLAYER_1]
+        player_2 = self.bitboards[self.PLAYER_2]
+        return [
+            1 if player_1 & bit else -1 if player_2 & bit else 0
+            for row_bits in CELL_BITS
+            for bit in row_bits
+        ]
 
     def convert_symbol(self, symbol):
         """Converts board symbols to numerical values used by ML models."""
@@ -317,77 +648,108 @@ class Connect4:
 
     def get_lowest_empty_row(self, column):
         """Finds the lowest available row in a column. Returns None if the column is full."""
-        # Start from bottom row and move upward
-        for row in range(ROW_COUNT - 1, -1, -1):
-            if self.board[row][column] == " ":
-                return row
-        return None
+        if self.heights[column] == ROW_COUNT:
+            return None
+        return ROW_COUNT - 1 - self.heights[column]
 
     def _print_tree_recursive(
         self,
-        board_state,
         depth,
         maximising_player,
         indent,
         alpha,
         beta,
         player_symbol,
-        output_widget,
+        out=None,
+        max_print_depth=None,
     ):
-        """Recursively builds and displays the minimax decision tree in the given output widget."""
+        """Recursively searches the minimax decision tree, appending its lines to `out` (skipped if None).
+
+        Below `max_print_depth` levels, each subtree is appended as a (placeholder line, subtree lines)
+        tuple instead, so the GUI can show it collapsed and expand it on demand.
+        """
         indent_str = "|   " * indent
-        valid_moves = [col for col in range(COLUMN_COUNT) if board_state[0][col] == " "]
+
+        # Reuse an earlier result for this position (the root is always expanded)
+        tt_key = self._tt_key(player_symbol, maximising_player)
+        if indent > 0:
+            hit, move, score = self._tt_probe(self.tt, tt_key, depth, alpha, beta)
+            if hit:
+                if out is not None:
+                    out.append(f"{indent_str}└── Score: {score} (cached)\n")
+                return move, score
+
+        valid_moves = [col for col in MOVE_ORDER if self.is_valid_move(col)]
 
         # Reached max depth or no valid moves
         if depth == 0 or not valid_moves:
             score = self.evaluate_board(player_symbol)
-            output_widget.insert(tk.END, f"{indent_str}└── Score: {score}\n")
+            self._tt_store(self.tt, tt_key, depth, score, None)
+            if out is not None:
+                out.append(f"{indent_str}└── Score: {score}\n")
             return None, score
 
+        # Collect deeper subtrees on their own, behind a placeholder line
+        if out is not None and max_print_depth and indent >= max_print_depth:
+            subtree = []
+            out.append((f"{indent_str}└── … (click to expand)\n", subtree))
+            return self._print_tree_recursive(
+                depth,
+                maximising_player,
+                indent,
+                alpha,
+                beta,
+                player_symbol,
+                subtree,
+                indent + max_print_depth,
+            )
+
+        alpha_orig, beta_orig = alpha, beta
+
+        # Order moves: last best move at this depth, then most threats created, then centre-out
+        current_symbol = (
+            player_symbol if maximising_player else self.OPPONENT[player_symbol]
+        )
+        pv_move = self.pv.get(depth)
+        threats = {}
+        for col in valid_moves:
+            self.drop_disc(col, current_symbol)
+            threats[col] = self.count_threats(current_symbol)
+            self._undo_drop(col, current_symbol)
+        valid_moves.sort(key=lambda col: (col != pv_move, -threats[col]))
+
         # Initialise best score depending on turn type
-        best_score = -math.inf if maximising_player else math.inf
+        best_score = NEG_INF if maximising_player else POS_INF
         best_move = None
 
         pruned_after = 0
 
         for col in valid_moves:
             pruned_after += 1  # count this move
-            # Select symbol for current turn
-            current_symbol = (
-                player_symbol
-                if maximising_player
-                else (
-                    self.PLAYER_1 if player_symbol == self.PLAYER_2 else self.PLAYER_2
-                )
-            )
 
             # Simulate placing a piece in the column
-            row = self._simulate_drop(board_state, col, current_symbol)
-            if row is None:
-                continue  # skip if column is full
-
-            move_label = "Max" if maximising_player else "Min"
-            output_widget.insert(
-                tk.END,
-                f"{indent_str}├── Column {col} ({move_label}, {current_symbol})\n",
-            )
+            self.drop_disc(col, current_symbol)
+
+            if out is not None:
+                move_label = "Max" if maximising_player else "Min"
+                out.append(
+                    f"{indent_str}├── Column {col} ({move_label}, {current_symbol})\n"
+                )
 
             # Switch player for next step
-            next_symbol = (
-                self.PLAYER_1 if current_symbol == self.PLAYER_2 else self.PLAYER_2
-            )
+            next_symbol = self.OPPONENT[current_symbol]
 
             _, score = self._print_tree_recursive(
-                board_state,
                 depth - 1,
                 not maximising_player,
                 indent + 1,
                 alpha,
                 beta,
                 next_symbol,
-                output_widget,
+                out,
+                max_print_depth,
             )
-            board_state[row][col] = " "  # undo move after simulation
+            self._undo_drop(col, current_symbol)  # undo move after simulation
 
             # Update best score and pruning values
             if maximising_player:
@@ -403,28 +765,46 @@ class Connect4:
 
             # Alpha-beta pruning
             if alpha >= beta:
-                branch_word = "branch" if pruned_after == 1 else "branches"
-                output_widget.insert(
-                    tk.END,
-                    f"{indent_str}│   └── Pruned (α ≥ β) after {pruned_after} {branch_word}\n",
-                )
+                if out is not None:
+                    branch_word = "branch" if pruned_after == 1 else "branches"
+                    out.append(
+                        f"{indent_str}│   └── Pruned (α ≥ β) after {pruned_after} {branch_word}\n"
+                    )
                 break
 
+        self.pv[depth] = best_move
+
+        self._tt_store(
+            self.tt, tt_key, depth, best_score, best_move, alpha_orig, beta_orig
+        )
+
         # Only print final decision at root
-        if indent == 0:
-            output_widget.insert(
-                tk.END,
-                f"\nBest opening move: Column {best_move} with score {best_score}\n",
+        if indent == 0 and out is not None:
+            out.append(
+                f"\nBest opening move: Column {best_move} with score {best_score}\n"
             )
         return best_move, best_score
 
-    def _simulate_drop(self, board, column, symbol):
-        """Simulates a disc drop without altering the actual game state. Returns the row if successful."""
-        for row in range(ROW_COUNT - 1, -1, -1):
-            if board[row][column] == " ":
-                board[row][column] = symbol
-                return row
-        return None
+
+# Score of a window for every (player count, opponent count) pair, so evaluate_board
+# looks scores up instead of running the assess_pattern cascade once per window
+WINDOW_SCORES = tuple(
+    tuple(
+        Connect4.assess_pattern(player_count, opponent_count)
+        for opponent_count in range(5)
+    )
+    for player_count in range(5)
+)
+
+# Move function for each AI agent type, called with (game, symbol, model). Shared by
+# the GUI and performance evaluation, so a new agent type only needs adding here
+AGENT_MOVES = {
+    "random": lambda game, symbol, model: game.random_agent(),
+    "smart": lambda game, symbol, model: game.smart_agent(symbol),
+    "minimax": lambda game, symbol, model: game.minimax_agent_move(symbol),
+    "ml": lambda game, symbol, model: game.ml_agent_predict(model),
+    "minimax_ml": lambda game, symbol, model: game.ml_agent_predict(model),
+}
 
 
 # Start game
@@ -437,16 +817,6 @@ if __name__ == "__main__":
         SEARCH_DEPTH,
     )
 
-    # Map user-friendly names to internal agent types
-    AGENT_MAP = {
-        "Human": "human",
-        "Random Agent": "random",
-        "Smart Agent": "smart",
-        "Minimax Agent": "minimax",
-        "Basic ML Agent": "ml",
-        "Minimax-Trained ML Agent": "minimax_ml",
-    }
-
     # Load pre-trained ML models
     basic_ml_model = joblib.load(
         "ml_agent.pkl"  # trained on UCI Connect-4 dataset: https://archive.ics.uci.edu/dataset/26/connect+4
@@ -455,11 +825,7 @@ if __name__ == "__main__":
         "ml_agent_minimax.pkl"  # trained on minimax-generated data
     )
 
-    def start_game(agent1_name, agent2_name, root):
-        # Get agent types from UI selection
-        agent1_type = AGENT_MAP.get(agent1_name, "human")
-        agent2_type = AGENT_MAP.get(agent2_name, "human")
-
+    def start_game(agent1_type, agent2_type, root, start_screen):
         # Select models if needed
         agent1_model = (
             basic_ml_model
@@ -472,11 +838,14 @@ if __name__ == "__main__":
             else minimax_ml_model if agent2_type == "minimax_ml" else None
         )
 
-        # Launch game GUI
-        Connect4GUI(agent1_type, agent2_type, agent1_model, agent2_model, root)
+        # Launch game GUI in the same window as the start screen
+        Connect4GUI(
+            agent1_type, agent2_type, agent1_model, agent2_model, root, start_screen
+        )
 
     # Set up and start the GUI
     root = tk.Tk()
-    root.title("Connect 4 Setup")
-    StartScreen(root, lambda a1, a2: start_game(a1, a2, root))
+    start_screen = StartScreen(
+        root, lambda a1, a2: start_game(a1, a2, root, start_screen)
+    )
     root.mainloop()
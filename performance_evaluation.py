@@ -5,175 +5,228 @@ This script runs automated matchups between different AI agent types (Random, Sm
 and Minimax-Trained ML) using the Connect4 class. It records key performance metrics across multiple games, including:
 - Win/loss/draw outcomes
 - Average move time per agent
-- Memory usage
+- Memory usage (resident set size of the worker process that played the game, not of the whole run)
 - Minimax-specific stats (nodes expanded, depth reached, heuristic delta, branching factor)
 
 The results from each matchup are saved to `game_results.csv`, which was used for visualisation in Jupyter Notebook.
+Games are seeded from BASE_SEED and each row records its seed, so any run or single game can be replayed.
 
 Run this script with `python performance_evaluation.py` to regenerate 'game_results.csv'.
+Games run in parallel on every CPU core by default, so move times and memory are measured while
+other games compete for the machine. They are not comparable with results from the earlier
+one-game-at-a-time script; use `python performance_evaluation.py --workers 1` for timing runs.
 """
 
-from game import Connect4
+from game import AGENT_MOVES, Connect4
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import argparse
 import joblib
 import csv
+import os
+import random
 import time
 import psutil  # for evaluating memory usage
 
 
-# Load ML models
-basic_ml_model = joblib.load("ml_agent.pkl")
-minimax_ml_model = joblib.load("ml_agent_minimax.pkl")
+# Columns of game_results.csv, one row per game
+FIELDNAMES = [
+    "matchup",
+    "winner",
+    "moves",
+    "minimax_nodes",
+    "minimax_depth",
+    "avg_time_agent1",
+    "avg_time_agent2",
+    "win_type",
+    "memory_mb",
+    "avg_branching_factor",
+    "avg_heuristic_delta",
+    "seed",
+]
+
+# Game i of every matchup is seeded with BASE_SEED + i, so runs are reproducible
+BASE_SEED = 0
+
+# Trained model file for each ML agent type, loaded once per worker process
+MODEL_FILES = {"ml": "ml_agent.pkl", "minimax_ml": "ml_agent_minimax.pkl"}
+
+# Per-process state, set up on first use (workers set it up front in _init_worker)
+process = None  # this process's psutil handle, for memory usage
+models = {}  # loaded ML model for each ML agent type
+
+
+def _get_process():
+    """Returns this process's psutil handle, opening it on first use."""
+    global process
+    if process is None:
+        process = psutil.Process()
+    return process
+
+
+def _get_model(agent_type):
+    """Returns the ML model for an agent type (None for non-ML agents), loading it on first use."""
+    if agent_type in MODEL_FILES and agent_type not in models:
+        models[agent_type] = joblib.load(MODEL_FILES[agent_type])
+    return models.get(agent_type)
+
+
+def _init_worker(agent_types):
+    """Opens a psutil handle on the worker process and loads the ML models its matchup needs, reused for every game it plays."""
+    _get_process()
+    for agent_type in agent_types:
+        _get_model(agent_type)
+
+
+def play_game(agent1_type, agent2_type, seed):
+    """Plays one game between two AI agents and returns its performance metrics like outcome, move speed, and memory usage.
+
+    Works in worker processes and when called directly, e.g. to replay a game from its CSV seed.
+    """
+    # Forked worker processes start from copies of the same random state, so seed each game
+    random.seed(seed)
+
+    agent1_model = _get_model(agent1_type)
+    agent2_model = _get_model(agent2_type)
+    game = Connect4(
+        agent1_type, agent2_type, agent1_model, agent2_model, collect_stats=True
+    )
+
+    # Resolve each agent's move function once, rather than on every move
+    if agent1_type not in AGENT_MOVES or agent2_type not in AGENT_MOVES:
+        raise ValueError("Agent type must be AI.")
+    agent1_move = AGENT_MOVES[agent1_type]
+    agent2_move = AGENT_MOVES[agent2_type]
+    player_1 = game.PLAYER_1
+    perf_counter_ns = time.perf_counter_ns
+
+    # Which sides need their minimax stats reset before each move
+    reset1 = agent1_type == "minimax"
+    reset2 = agent2_type == "minimax"
+    has_minimax = reset1 or reset2
+
+    # Track turn order and outcome
+    current_symbol = player_1
+    turns = 0
+    winner = "draw"
+    win_type = None
+
+    # Timing (integer nanoseconds) and move count metrics
+    total_ns_agent1 = 0
+    total_ns_agent2 = 0
+    move_count_agent1 = 0
+    move_count_agent2 = 0
+
+    while True:
+        is_agent1 = current_symbol == player_1
+
+        # Reset metrics for minimax-specific tracking
+        if (is_agent1 and reset1) or (not is_agent1 and reset2):
+            game.reset_stats()
+
+        # Time the agent's move
+        start_ns = perf_counter_ns()
+
+        if is_agent1:
+            move = agent1_move(game, current_symbol, agent1_model)
+        else:
+            move = agent2_move(game, current_symbol, agent2_model)
+
+        move_ns = perf_counter_ns() - start_ns
+
+        if is_agent1:
+            total_ns_agent1 += move_ns
+            move_count_agent1 += 1
+        else:
+            total_ns_agent2 += move_ns
+            move_count_agent2 += 1
+
+        if move is None or not game.drop_disc(move, current_symbol):
+            break
+
+        turns += 1
+
+        win_type = game.check_winner(current_symbol)
+        if win_type:
+            winner = "agent1" if is_agent1 else "agent2"
+            break
+
+        if game.is_full():
+            winner = "draw"
+            break
+
+        current_symbol = game.OPPONENT[current_symbol]
+
+    # Post-game metrics
+    # After game ends - calculate metrics, converting nanoseconds to seconds
+    avg_time_agent1 = (
+        total_ns_agent1 / move_count_agent1 / 1e9 if move_count_agent1 > 0 else 0
+    )
+    avg_time_agent2 = (
+        total_ns_agent2 / move_count_agent2 / 1e9 if move_count_agent2 > 0 else 0
+    )
+
+    # Track memory usage of this worker process
+    memory_usage_mb = _get_process().memory_info().rss / 1024**2  # convert to MB
+
+    # Averages come from running totals kept during the search
+    avg_branching = game.average_branching_factor
+    avg_heuristic_delta = game.average_heuristic_delta
+
+    # Return game data
+    return {
+        "winner": winner,
+        "moves": turns,
+        "minimax_nodes": game.nodes_expanded if has_minimax else "",
+        "minimax_depth": game.search_depth_used if has_minimax else "",
+        "avg_time_agent1": round(avg_time_agent1, 5),
+        "avg_time_agent2": round(avg_time_agent2, 5),
+        "win_type": win_type if winner != "draw" else "draw",
+        "memory_mb": round(memory_usage_mb, 2),
+        "avg_branching_factor": round(avg_branching, 2) if has_minimax else "",
+        "avg_heuristic_delta": round(avg_heuristic_delta, 2) if has_minimax else "",
+        "seed": seed,
+    }
 
 
 def simulate_match(
-    agent1_type, agent2_type, agent1_model=None, agent2_model=None, games=500
+    writer, agent1_type, agent2_type, games=500, base_seed=BASE_SEED, workers=None
 ):
-    """Runs multiple games between two AI agents and logs performance metrics like win rate, move speed, and memory usage."""
-    all_game_data = []
-
-    # Simulate multiple games between the two agents
-    for _ in range(games):
-        game = Connect4(agent1_type, agent2_type, agent1_model, agent2_model)
-
-        # Track turn order and outcome
-        current_symbol = game.PLAYER_1
-        turns = 0
-        winner = "draw"
-        win_type = None
-
-        # Timing and move count metrics
-        total_time_agent1 = 0
-        total_time_agent2 = 0
-        move_count_agent1 = 0
-        move_count_agent2 = 0
-
-        while True:
-            if current_symbol == game.PLAYER_1:
-                agent_type = agent1_type
-                model = agent1_model
-            else:
-                agent_type = agent2_type
-                model = agent2_model
-
-            # Reset metrics for minimax-specific tracking
-            if agent_type == "minimax":
-                game.nodes_expanded = 0
-                game.search_depth_used = 0
-                game.branching_factors = []
-                game.heuristic_deltas = []
-
-            # Time the agent's move
-            start_time = time.perf_counter()
-
-            if agent_type == "random":
-                move = game.random_agent()
-            elif agent_type == "smart":
-                move = game.smart_agent()
-            elif agent_type == "minimax":
-                move = game.minimax_agent_move(current_symbol)
-            elif agent_type in ("ml", "minimax_ml"):
-                move = game.ml_agent_predict(model)
-            else:
-                raise ValueError("Agent type must be AI.")
-
-            end_time = time.perf_counter()
-            move_duration = end_time - start_time
-
-            if current_symbol == game.PLAYER_1:
-                total_time_agent1 += move_duration
-                move_count_agent1 += 1
-            else:
-                total_time_agent2 += move_duration
-                move_count_agent2 += 1
-
-            if move is None or not game.drop_disc(move, current_symbol):
-                break
-
-            turns += 1
-
-            win_type = game.check_winner(current_symbol)
-            if win_type:
-                winner = "agent1" if current_symbol == game.PLAYER_1 else "agent2"
-                break
-
-            if game.is_full():
-                winner = "draw"
-                break
-
-            current_symbol = (
-                game.PLAYER_2 if current_symbol == game.PLAYER_1 else game.PLAYER_1
-            )
-
-        # Post-game metrics
-        # After game ends - calculate metrics
-        avg_time_agent1 = (
-            total_time_agent1 / move_count_agent1 if move_count_agent1 > 0 else 0
-        )
-        avg_time_agent2 = (
-            total_time_agent2 / move_count_agent2 if move_count_agent2 > 0 else 0
-        )
-
-        # Track memory usage
-        process = psutil.Process()
-        memory_usage_mb = process.memory_info().rss / 1024**2  # convert to MB
-
-        # Calculate average branching factor
-        avg_branching = (
-            sum(game.branching_factors) / len(game.branching_factors)
-            if game.branching_factors
-            else 0
-        )
-
-        avg_heuristic_delta = (
-            sum(game.heuristic_deltas) / len(game.heuristic_deltas)
-            if game.heuristic_deltas
-            else 0
-        )
-
-        # Save game data
-        all_game_data.append(
-            {
-                "matchup": f"{agent1_type}_vs_{agent2_type}",
-                "winner": winner,
-                "moves": turns,
-                "minimax_nodes": (
-                    game.nodes_expanded
-                    if "minimax" in [agent1_type, agent2_type]
-                    else ""
-                ),
-                "minimax_depth": (
-                    game.search_depth_used
-                    if "minimax" in [agent1_type, agent2_type]
-                    else ""
-                ),
-                "avg_time_agent1": round(avg_time_agent1, 5),
-                "avg_time_agent2": round(avg_time_agent2, 5),
-                "win_type": win_type if winner != "draw" else "draw",
-                "memory_mb": round(memory_usage_mb, 2),
-                "avg_branching_factor": (
-                    round(avg_branching, 2)
-                    if "minimax" in [agent1_type, agent2_type]
-                    else ""
-                ),
-                "avg_heuristic_delta": (
-                    round(avg_heuristic_delta, 2)
-                    if "minimax" in [agent1_type, agent2_type]
-                    else ""
-                ),
-            }
-        )
-
-    return all_game_data
-
-
-# Run matchups
-results = []
-results += simulate_match("random", "smart")
-results += simulate_match("smart", "minimax")
-results += simulate_match("minimax", "ml", agent2_model=basic_ml_model)
-
-# Save to CSV
-with open("game_results.csv", "w", newline="") as f:
-    writer = csv.DictWriter(f, fieldnames=results[0].keys())
-    writer.writeheader()
-    writer.writerows(results)
+    """Runs multiple games between two AI agents across worker processes, writing each game's metrics to the CSV writer.
+
+    workers caps the number of processes (default: one per CPU core); 1 plays the games one at a time.
+    """
+    matchup = f"{agent1_type}_vs_{agent2_type}"
+    seeds = range(base_seed, base_seed + games)
+    play = partial(play_game, agent1_type, agent2_type)
+
+    # Games are independent, so spread them over the workers. Chunks cut the
+    # per-task messaging between processes; rows still arrive in game order
+    chunksize = max(1, games // (4 * (workers or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=((agent1_type, agent2_type),),
+    ) as executor:
+        for row in executor.map(play, seeds, chunksize=chunksize):
+            writer.writerow({"matchup": matchup, **row})
+
+
+# Worker processes may import this file, so only the main process runs the matchups
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes per matchup (default: one per CPU core; 1 for timing runs)",
+    )
+    args = parser.parse_args()
+
+    # Run matchups, saving each game to CSV as it finishes
+    with open("game_results.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        simulate_match(writer, "random", "smart", workers=args.workers)
+        simulate_match(writer, "smart", "minimax", workers=args.workers)
+        simulate_match(writer, "minimax", "ml", workers=args.workers)